@@ -3,10 +3,9 @@
 
 import sqlite3
 import numpy as np
-from scipy.io.wavfile import write
-from io import BytesIO
 import tempfile
 import os
+import struct
 from kivy.app import App
 from kivy.uix.screenmanager import ScreenManager, Screen
 from kivy.uix.boxlayout import BoxLayout
@@ -23,13 +22,12 @@ from kivy.clock import Clock
 from kivy.graphics import Color, Line
 from kivy.metrics import dp
 import math
-import random
+import functools
+from collections import OrderedDict
 
 # Initialize DB
-def init_db():
-    conn = sqlite3.connect('users.db')
-    c = conn.cursor()
-    c.execute('''CREATE TABLE IF NOT EXISTS users (
+def init_db(conn):
+    conn.execute('''CREATE TABLE IF NOT EXISTS users (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         name TEXT,
         surname TEXT,
@@ -42,74 +40,167 @@ def init_db():
         dissimilarity REAL
     )''')
     conn.commit()
-    conn.close()
 
-init_db()
+def open_db():
+    # One connection serves the whole session; WAL with NORMAL sync avoids an
+    # fsync of the main database file on every commit
+    conn = sqlite3.connect('users.db')
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    init_db(conn)
+    return conn
 
 # Global variables
 current_screen = 'login'
 test_frequencies = [4000, 2000, 1000, 500, 250]
-thresholds = {'left': {}, 'right': {}}
+freq_index = {freq: i for i, freq in enumerate(test_frequencies)}
+ears = ['left', 'right']
+ear_index = {ear: i for i, ear in enumerate(ears)}
+# Thresholds indexed by (ear, frequency) aligned with ears/test_frequencies; NaN until measured
+thresholds = np.full((len(ears), len(test_frequencies)), np.nan, dtype=np.float32)
 current_test = None
 test_sequence = []
 current_test_index = 0
 total_tests = 0
 step_size_large = 20
 step_size_small = 10
+start_level = -10
 user_id = None
+rng = np.random.default_rng()
+response_dtype = np.dtype([('level', 'f4'), ('heard', '?'), ('catch_trial', '?'), ('correct', '?')])
 
 # Audio functions
+sample_rate = 44100
+tone_durations = [0.3, 0.7, 1.0]
+tone_cache = {}
+pcm_out = np.zeros((sample_rate, 2), dtype='<i2')  # output buffer for the longest (1 s) tone
+sound_cache = OrderedDict()  # WAV bytes -> (temp file path, loaded Sound), least recently used first
+max_cached_sounds = 32
+status_reset_event = None
+# Linear amplitude for every whole-dB level the staircase can reach (-60..0 dB)
+level_amplitudes = {level_db: math.pow(10, level_db / 20) for level_db in range(-60, 1)}
+
+def synthesize_tone(freq, duration):
+    # Phase = n * 2*pi*f/sr, sine taken in place
+    phase = np.arange(int(sample_rate * duration), dtype=np.float64)
+    phase *= 2 * np.pi * freq / sample_rate
+    note = np.sin(phase, out=phase).astype(np.float32)
+    return note, float(np.max(np.abs(note)))
+
+def build_tone_cache():
+    # Every tone the app plays uses a fixed frequency/duration, so build the mono
+    # unit-amplitude buffers (and their peaks) once and only scale them at play time
+    for freq in sorted(set(test_frequencies) | {1000}):
+        for duration in tone_durations:
+            tone_cache[(freq, duration)] = synthesize_tone(freq, duration)
+
+build_tone_cache()
+
+def wav_header(n_frames, channels=2, bits=16):
+    # Canonical 44-byte PCM WAV header for little-endian 16-bit samples
+    block_align = channels * bits // 8
+    data_size = n_frames * block_align
+    return struct.pack('<4sI4s4sIHHIIHH4sI', b'RIFF', 36 + data_size, b'WAVE', b'fmt ', 16, 1,
+                       channels, sample_rate, sample_rate * block_align, block_align, bits,
+                       b'data', data_size)
+
+@functools.lru_cache(maxsize=128)
 def generate_tone(freq=1000, duration=0.3, volume=1.0, channel='both'):
-    sample_rate = 44100
-    t = np.linspace(0, duration, int(sample_rate * duration), False)
-    note = np.sin(2 * np.pi * freq * t) * volume
+    cached = tone_cache.get((freq, duration))
+    if cached is None:
+        cached = synthesize_tone(freq, duration)
+    unit_tone, unit_peak = cached
+
+    # Scale to the 16-bit range: volume 1.0 peaks at 80% of full scale
+    gain = volume * 32767 * 0.8 / unit_peak if unit_peak > 0 else 0
+    n = len(unit_tone)
+    audio = pcm_out[:n] if n <= len(pcm_out) else np.empty((n, 2), dtype='<i2')
 
+    # Write the tone into the active channel(s) only; the other one is silent
     if channel == 'both':
-        audio = np.column_stack((note, note))
-    elif channel == 'left':
-        silence = np.zeros_like(note)
-        audio = np.column_stack((note, silence))
-    else:  # right
-        silence = np.zeros_like(note)
-        audio = np.column_stack((silence, note))
-
-    # Normalize to 16-bit range
-    if np.max(np.abs(audio)) > 0:
-        audio = audio / np.max(np.abs(audio)) * 32767 * 0.8
-    audio = audio.astype(np.int16)
-
-    bio = BytesIO()
-    write(bio, sample_rate, audio)
-    bio.seek(0)
-    return bio.getvalue()
+        np.multiply(unit_tone[:, None], np.float32(gain), out=audio, casting='unsafe')
+    else:
+        active = 0 if channel == 'left' else 1
+        np.multiply(unit_tone, np.float32(gain), out=audio[:, active], casting='unsafe')
+        audio[:, 1 - active] = 0
+
+    return wav_header(len(audio)) + audio.tobytes()
+
+def load_sound(data):
+    # Loaded Sounds are cached by WAV payload
+    cached = sound_cache.get(data)
+    if cached is not None:
+        sound_cache.move_to_end(data)
+        return cached[1]
 
-def play_sound(data):
     # Save to a temporary file since SoundLoader doesn't support BytesIO directly
     with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
         temp_file.write(data)
         temp_file_path = temp_file.name
 
     sound = SoundLoader.load(temp_file_path)
+    if not sound:
+        os.unlink(temp_file_path)
+        return None
+    sound_cache[data] = (temp_file_path, sound)
+    if len(sound_cache) > max_cached_sounds:
+        _, (old_path, old_sound) = sound_cache.popitem(last=False)
+        old_sound.unload()
+        os.unlink(old_path)
+    return sound
+
+def play_sound(data):
+    sound = load_sound(data)
     if sound:
+        # Cached Sounds are reused, so rewind in case the last play hasn't finished
+        sound.stop()
+        sound.seek(0)
         sound.play()
-        # Schedule cleanup of temporary file after playback
-        Clock.schedule_once(lambda dt: os.unlink(temp_file_path), sound.length + 0.1)
 
-def play_channel_test(channel):
-    status_label = App.get_running_app().root.get_screen('device_check').ids.get('status', Label(text=''))
+def release_sounds():
+    for temp_file_path, sound in sound_cache.values():
+        sound.unload()
+        os.unlink(temp_file_path)
+    sound_cache.clear()
+
+def channel_test_tone(channel):
+    return generate_tone(freq=1000, duration=0.7, volume=0.5, channel=channel)
+
+def reference_tone():
+    return generate_tone(freq=1000, duration=1.0, volume=1.0, channel='both')
+
+def test_tone(freq, channel, level_db):
+    amplitude = level_amplitudes.get(level_db)
+    if amplitude is None:
+        amplitude = math.pow(10, level_db / 20)
+    return generate_tone(freq=freq, duration=0.3, volume=amplitude, channel=channel)
+
+def preload_tones():
+    # Load every tone a session can play: reference, channel checks and both trial
+    # levels (a miss at start_level steps up once and is clamped at 0 dB)
+    load_sound(reference_tone())
+    for ear in ears:
+        load_sound(channel_test_tone(ear))
+    retry_level = min(0, start_level + step_size_large)
+    for freq in test_frequencies:
+        for ear in ears:
+            load_sound(test_tone(freq, ear, start_level))
+            load_sound(test_tone(freq, ear, retry_level))
+
+def play_channel_test(channel, status_label):
     status_label.text = f'Playing in {channel.upper()} ear 🔊'
-    data = generate_tone(freq=1000, duration=0.7, volume=0.5, channel=channel)
-    play_sound(data)
-    Clock.schedule_once(lambda dt: setattr(status_label, 'text', ''), 1)
+    play_sound(channel_test_tone(channel))
+    # Only the latest click's reset should fire; repeated clicks would otherwise stack them
+    global status_reset_event
+    if status_reset_event is not None:
+        status_reset_event.cancel()
+    status_reset_event = Clock.schedule_once(lambda dt: setattr(status_label, 'text', ''), 1)
 
 def play_reference_tone():
-    data = generate_tone(freq=1000, duration=1.0, volume=1.0, channel='both')
-    play_sound(data)
+    play_sound(reference_tone())
 
 def play_test_tone(freq, channel, level_db):
-    amplitude = math.pow(10, level_db / 20)
-    data = generate_tone(freq=freq, duration=0.3, volume=amplitude, channel=channel)
-    play_sound(data)
+    play_sound(test_tone(freq, channel, level_db))
 
 # Screen classes
 class LoginScreen(Screen):
@@ -181,14 +272,12 @@ class LoginScreen(Screen):
             'anc_mode': 'ON' if self.anc_on.state == 'down' else 'OFF'
         }
         # Save to DB
-        conn = sqlite3.connect('users.db')
-        c = conn.cursor()
-        c.execute('''INSERT INTO users (name, surname, age_group, gender, headphones_correct, anc_mode)
-                     VALUES (?, ?, ?, ?, ?, ?)''', (data['name'], data['surname'], data['age_group'], 
-                                                    data['gender'], data['headphones_correct'], data['anc_mode']))
+        db = App.get_running_app().db
+        with db:
+            c = db.execute('''INSERT INTO users (name, surname, age_group, gender, headphones_correct, anc_mode)
+                                VALUES (?, ?, ?, ?, ?, ?)''', (data['name'], data['surname'], data['age_group'], 
+                                                               data['gender'], data['headphones_correct'], data['anc_mode']))
         user_id = c.lastrowid
-        conn.commit()
-        conn.close()
         App.get_running_app().root.current = 'welcome'
 
 class WelcomeScreen(Screen):
@@ -266,7 +355,7 @@ class DeviceCheckScreen(Screen):
         self.add_widget(layout)
     
     def play_channel(self, channel):
-        play_channel_test(channel)
+        play_channel_test(channel, self.status)
     
     def ready(self, instance):
         App.get_running_app().root.current = 'calibration'
@@ -328,16 +417,14 @@ class InstructionsScreen(Screen):
     
     def start_test(self, instance):
         global test_sequence, current_test_index, total_tests
-        thresholds['left'] = {}
-        thresholds['right'] = {}
-        test_sequence = []
-        for freq in test_frequencies:
-            for ear in ['left', 'right']:
-                test_sequence.append({'freq': freq, 'ear': ear})
+        thresholds.fill(np.nan)
+        # One (freq, ear index) row per test, frequency-major with the left ear first
+        freq_grid, ear_grid = np.meshgrid(test_frequencies, np.arange(len(ears)), indexing='ij')
+        test_sequence = np.stack([freq_grid.ravel(), ear_grid.ravel()], axis=1)
         current_test_index = 0
         total_tests = len(test_sequence)
         App.get_running_app().root.current = 'testing'
-        Clock.schedule_once(lambda dt: run_next_threshold_test(), 0)
+        run_next_threshold_test()
     
     def back(self, instance):
         App.get_running_app().root.current = 'calibration'
@@ -396,24 +483,23 @@ def run_next_threshold_test(dt=None):
     if current_test_index >= total_tests:
         show_results_screen()
         return
-    test = test_sequence[current_test_index]
-    freq = test['freq']
-    ear = test['ear']
-    app = App.get_running_app()
-    app.root.get_screen('testing').ids['response_status'].text = 'Listen carefully... 👂'
+    freq = int(test_sequence[current_test_index, 0])
+    ear = ears[test_sequence[current_test_index, 1]]
+    screen = App.get_running_app().root.get_screen('testing')
+    screen.response_status.text = 'Listen carefully... 👂'
     progress = (current_test_index / total_tests) * 100
-    app.root.get_screen('testing').ids['progress'].value = progress
-    app.root.get_screen('testing').ids['progress_label'].text = f'{int(progress)}%'
+    screen.progress.value = progress
+    screen.progress_label.text = f'{int(progress)}%'
     ear_symbol = '👂 Left' if ear == 'left' else '👂 Right'
-    app.root.get_screen('testing').ids['ear_label'].text = f'{ear_symbol} Ear'
-    app.root.get_screen('testing').ids['status_label'].text = f'Frequency: {freq} Hz 🎵'
-    app.root.get_screen('testing').ids['test_info'].text = f'Test {current_test_index + 1}/{total_tests} ⚡'
+    screen.ear_label.text = f'{ear_symbol} Ear'
+    screen.status_label.text = f'Frequency: {freq} Hz 🎵'
+    screen.test_info.text = f'Test {current_test_index + 1}/{total_tests} ⚡'
     global current_test
     current_test = AdaptiveThresholdTest(freq, ear)
     current_test.start()
 
 def on_threshold_complete(freq, ear, threshold):
-    thresholds[ear][freq] = threshold
+    thresholds[ear_index[ear], freq_index[freq]] = threshold
     global current_test_index
     current_test_index += 1
     Clock.schedule_once(run_next_threshold_test, 0.5)
@@ -422,17 +508,22 @@ class AdaptiveThresholdTest:
     def __init__(self, frequency, ear):
         self.frequency = frequency
         self.ear = ear
-        self.current_level = -10
+        self.current_level = start_level
         self.step_size = step_size_large
-        self.reversals = []
-        self.responses = []
         self.trial_count = 0
         self.max_trials = 10
-        self.last_direction = None
+        # A trial presents the tone at most 3 times, which bounds the response count
+        self.responses = np.zeros(self.max_trials * 3, dtype=response_dtype)
+        self.n_responses = 0
+        self.reversals = np.empty(self.max_trials, dtype=np.float32)
+        self.n_reversals = 0
+        self.last_direction = 0  # -1 down, +1 up, 0 before the first step
         self.catch_trial_probability = 0.03
+        self.catch_trials = rng.random(self.max_trials) < self.catch_trial_probability
         self.is_catch_trial = False
         self.waiting_for_response = False
         self.retry_attempts = 0
+        self.screen = App.get_running_app().root.get_screen('testing')
 
     def start(self):
         self.run_trial()
@@ -442,16 +533,14 @@ class AdaptiveThresholdTest:
             self.complete_test()
             return
         self.trial_count += 1
-        self.is_catch_trial = random.random() < self.catch_trial_probability
-        app = App.get_running_app()
-        app.root.get_screen('testing').ids['response_status'].text = 'Listen carefully... 👂'
-        app.root.get_screen('testing').ids['yes_btn'].disabled = True
-        app.root.get_screen('testing').ids['no_btn'].disabled = True
-        Clock.schedule_once(lambda dt: self.present_stimulus(), 0)
+        self.is_catch_trial = bool(self.catch_trials[self.trial_count - 1])
+        self.screen.response_status.text = 'Listen carefully... 👂'
+        self.screen.yes_btn.disabled = True
+        self.screen.no_btn.disabled = True
+        self.present_stimulus()
 
     def present_stimulus(self):
         self.waiting_for_response = True
-        app = App.get_running_app()
         if not self.is_catch_trial:
             play_test_tone(self.frequency, self.ear, self.current_level)
             Clock.schedule_once(lambda dt: self.response_ready(), 0.4)
@@ -459,27 +548,21 @@ class AdaptiveThresholdTest:
             Clock.schedule_once(lambda dt: self.response_ready(), 0.3)
 
     def response_ready(self):
-        app = App.get_running_app()
-        app.root.get_screen('testing').ids['response_status'].text = 'Click YES or NO'
-        app.root.get_screen('testing').ids['yes_btn'].disabled = False
-        app.root.get_screen('testing').ids['no_btn'].disabled = False
+        self.screen.response_status.text = 'Click YES or NO'
+        self.screen.yes_btn.disabled = False
+        self.screen.no_btn.disabled = False
 
     def on_response(self, heard):
         if not self.waiting_for_response:
             return
         self.waiting_for_response = False
-        app = App.get_running_app()
-        app.root.get_screen('testing').ids['yes_btn'].disabled = True
-        app.root.get_screen('testing').ids['no_btn'].disabled = True
+        self.screen.yes_btn.disabled = True
+        self.screen.no_btn.disabled = True
 
-        status = app.root.get_screen('testing').ids['response_status']
+        status = self.screen.response_status
         correct_response = not self.is_catch_trial
-        self.responses.append({
-            'level': self.current_level,
-            'heard': heard,
-            'catch_trial': self.is_catch_trial,
-            'correct': heard == correct_response
-        })
+        self.responses[self.n_responses] = (self.current_level, heard, self.is_catch_trial, heard == correct_response)
+        self.n_responses += 1
 
         if self.is_catch_trial:
             status.text = 'False alarm ❌' if heard else 'Good! (No tone) 👍'
@@ -503,93 +586,79 @@ class AdaptiveThresholdTest:
             Clock.schedule_once(lambda dt: self.run_trial(), 1)
 
     def update_level(self, heard):
-        if heard:
-            new_level = self.current_level - self.step_size
-            if self.last_direction == 'up':
-                self.reversals.append(self.current_level)
-                if len(self.reversals) >= 1:
-                    self.step_size = step_size_small
-            self.last_direction = 'down'
-        else:
-            new_level = self.current_level + self.step_size
-            if self.last_direction == 'down':
-                self.reversals.append(self.current_level)
-                if len(self.reversals) >= 1:
-                    self.step_size = step_size_small
-            self.last_direction = 'up'
+        direction = -1 if heard else 1  # down after a heard tone, up after a miss
+        new_level = self.current_level + direction * self.step_size
+        if self.last_direction * direction < 0:  # direction changed: reversal
+            self.reversals[self.n_reversals] = self.current_level
+            self.n_reversals += 1
+            self.step_size = step_size_small
+        self.last_direction = direction
         self.current_level = max(-60, min(0, new_level))
 
     def complete_test(self):
-        valid_responses = [r for r in self.responses if not r['catch_trial']]
-        if len(self.reversals) >= 2:
-            threshold = sum(self.reversals[-2:]) / 2
+        responses = self.responses[:self.n_responses]
+        valid_responses = responses[~responses['catch_trial']]
+        if self.n_reversals >= 2:
+            threshold = float(self.reversals[self.n_reversals - 2:self.n_reversals].mean())
         else:
-            threshold_levels = []
-            for i in range(1, len(valid_responses)):
-                if valid_responses[i]['heard'] != valid_responses[i-1]['heard']:
-                    threshold_levels.append(valid_responses[i]['level'])
-            threshold = sum(threshold_levels) / len(threshold_levels) if threshold_levels else 0
+            # Levels at which the heard/not-heard answer flipped
+            heard = valid_responses['heard']
+            flips = np.flatnonzero(heard[1:] != heard[:-1]) + 1
+            threshold = float(valid_responses['level'][flips].mean()) if flips.size else 0
         on_threshold_complete(self.frequency, self.ear, threshold)
 
+# Audiogram plot positions, highest frequency first (approximate log scale)
+audiogram_x = np.array([300, 250, 200, 150, 100], dtype=np.float32)
+audiogram_y_base = 300
+
+def audiogram_points(levels):
+    # Unmeasured frequencies plot at 0 dB
+    y = audiogram_y_base - (np.nan_to_num(levels) + 60) * 2
+    return np.column_stack((audiogram_x, y)).ravel().tolist()
+
+# Results copy keyed by whether asymmetry was detected; only the dB figure varies
+status_texts = {True: '⚠️ Asymmetry Detected', False: '✅ No Asymmetry'}
+recommendation_templates = {
+    True: "Asymmetry detected (max difference: {:.1f} dB). ⚠️\nConsult an audiologist.",
+    False: "No asymmetry detected (max: {:.1f} dB). ✅\nThis is a demo result.",
+}
+
 def analyze_asymmetry():
-    asymmetry_detected = False
-    max_difference = 0
-    differences = {}
-    for freq in test_frequencies:
-        if freq in thresholds['left'] and freq in thresholds['right']:
-            diff = abs(thresholds['left'][freq] - thresholds['right'][freq])
-            differences[freq] = diff
-            max_difference = max(max_difference, diff)
-            if diff >= 20:
-                asymmetry_detected = True
-    recommendation = f"Asymmetry detected (max difference: {max_difference:.1f} dB). ⚠️\nConsult an audiologist." if asymmetry_detected else f"No asymmetry detected (max: {max_difference:.1f} dB). ✅\nThis is a demo result."
+    left, right = thresholds
+    if np.array_equal(left, right, equal_nan=True):
+        # Identical (or entirely unmeasured) audiograms need no comparison
+        max_difference = 0
+    else:
+        differences = np.abs(left - right)
+        differences = differences[~np.isnan(differences)]  # frequencies measured in both ears
+        max_difference = float(differences.max()) if differences.size else 0
+    asymmetry_detected = max_difference >= 20
+    recommendation = recommendation_templates[asymmetry_detected].format(max_difference)
     return {'asymmetry_detected': asymmetry_detected, 'max_difference': max_difference, 'recommendation': recommendation}
 
 def show_results_screen():
     app = App.get_running_app()
     app.root.current = 'results'
     analysis = analyze_asymmetry()
-    app.root.get_screen('results').ids['status_text'].text = '⚠️ Asymmetry Detected' if analysis['asymmetry_detected'] else '✅ No Asymmetry'
+    app.root.get_screen('results').ids['status_text'].text = status_texts[analysis['asymmetry_detected']]
     app.root.get_screen('results').ids['recommendation'].text = analysis['recommendation']
     
-    left_values = list(thresholds['left'].values())
-    right_values = list(thresholds['right'].values())
-    left_avg = sum(left_values) / len(left_values) if left_values else 0
-    right_avg = sum(right_values) / len(right_values) if right_values else 0
+    left, right = thresholds
+    left_values = left[~np.isnan(left)]
+    right_values = right[~np.isnan(right)]
+    left_avg = float(left_values.mean()) if left_values.size else 0
+    right_avg = float(right_values.mean()) if right_values.size else 0
     dissimilarity = analysis['max_difference']
     
     # Save to DB
-    conn = sqlite3.connect('users.db')
-    c = conn.cursor()
-    c.execute('UPDATE users SET left_avg=?, right_avg=?, dissimilarity=? WHERE id=?',
-              (left_avg, right_avg, dissimilarity, user_id))
-    conn.commit()
-    conn.close()
+    with app.db:
+        app.db.execute('UPDATE users SET left_avg=?, right_avg=?, dissimilarity=? WHERE id=?',
+                       (left_avg, right_avg, dissimilarity, user_id))
     
-    # Draw audiogram
-    chart_widget = app.root.get_screen('results').ids['chart_widget']
-    chart_widget.canvas.after.clear()
-    with chart_widget.canvas.after:
-        # Draw axes
-        Color(0, 0, 0, 1)
-        Line(points=[50, 50, 50, 350, 350, 350], width=2)  # x,y axes
-        # Plot points (simplified)
-        x_positions = [300, 250, 200, 150, 100]  # Approximate log scale
-        y_base = 300
-        # Left ear
-        left_points = []
-        for i, freq in enumerate(test_frequencies):
-            left_y = y_base - (thresholds['left'].get(freq, 0) + 60) * 2
-            left_points.extend([x_positions[i], left_y])
-        Color(0.2, 0.6, 1, 1)  # Blue for left
-        Line(points=left_points, width=2)
-        # Right ear
-        right_points = []
-        for i, freq in enumerate(test_frequencies):
-            right_y = y_base - (thresholds['right'].get(freq, 0) + 60) * 2
-            right_points.extend([x_positions[i], right_y])
-        Color(1, 0.3, 0.3, 1)  # Red for right
-        Line(points=right_points, width=2)
+    # Update audiogram lines (the canvas instructions are built once in ResultsScreen)
+    results_screen = app.root.get_screen('results')
+    results_screen.left_line.points = audiogram_points(left)
+    results_screen.right_line.points = audiogram_points(right)
 
 class ResultsScreen(Screen):
     def __init__(self, **kwargs):
@@ -607,6 +676,14 @@ class ResultsScreen(Screen):
         self.chart_widget = Widget()  # Use Widget for canvas drawing
         self.ids['chart_widget'] = self.chart_widget
         layout.add_widget(self.chart_widget)
+        with self.chart_widget.canvas.after:
+            # Draw axes
+            Color(0, 0, 0, 1)
+            Line(points=[50, 50, 50, 350, 350, 350], width=2)  # x,y axes
+            Color(0.2, 0.6, 1, 1)  # Blue for left
+            self.left_line = Line(points=[], width=2)
+            Color(1, 0.3, 0.3, 1)  # Red for right
+            self.right_line = Line(points=[], width=2)
         
         btn_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=dp(50), spacing=dp(10))
         try_again_btn = Button(text='🔄 Try Again', on_press=self.try_again)
@@ -618,8 +695,8 @@ class ResultsScreen(Screen):
         self.add_widget(layout)
     
     def try_again(self, instance):
-        global thresholds, current_test
-        thresholds = {'left': {}, 'right': {}}
+        global current_test
+        thresholds.fill(np.nan)
         current_test = None
         App.get_running_app().root.current = 'welcome'
     
@@ -629,6 +706,7 @@ class ResultsScreen(Screen):
 # Main App
 class HearingTestApp(App):
     def build(self):
+        self.db = open_db()
         sm = ScreenManager()
         sm.add_widget(LoginScreen(name='login'))
         sm.add_widget(WelcomeScreen(name='welcome'))
@@ -640,5 +718,12 @@ class HearingTestApp(App):
         sm.add_widget(ResultsScreen(name='results'))
         return sm
 
+    def on_start(self):
+        Clock.schedule_once(lambda dt: preload_tones(), 0)
+
+    def on_stop(self):
+        release_sounds()
+        self.db.close()
+
 if __name__ == '__main__':
     HearingTestApp().run()
\ No newline at end of file